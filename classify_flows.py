@@ -23,15 +23,34 @@ from ml_inference import (
 )
 
 
+# Explicit dtypes for the feature columns: skips pandas' inference pass and
+# roughly halves memory vs. the default int64/float64/object columns.
+CSV_FEATURE_DTYPES = {
+    "proto": "category",
+    "service": "category",
+    "spkts": "int32",
+    "dpkts": "int32",
+    "sbytes": "int64",
+    "dbytes": "int64",
+    "dur": "float32",
+}
+
+
 def load_features_from_csv(csv_path: str, art_dir: str = "models") -> pd.DataFrame:
     feats = get_feature_list(art_dir)
-    df_raw = pd.read_csv(csv_path)
-    missing = [c for c in feats if c not in df_raw.columns]
+
+    # Check the header first so a missing column gives a clear error.
+    header = pd.read_csv(csv_path, nrows=0)
+    missing = [c for c in feats if c not in header.columns]
     if missing:
         raise ValueError(
             f"Missing required feature columns in {csv_path}: {missing}"
         )
-    return df_raw[feats].copy()
+
+    # usecols lets the C parser skip all non-feature columns entirely.
+    dtype = {c: CSV_FEATURE_DTYPES[c] for c in feats if c in CSV_FEATURE_DTYPES}
+    df_raw = pd.read_csv(csv_path, usecols=feats, dtype=dtype)
+    return df_raw[feats]
 
 
 def main():
@@ -55,7 +74,13 @@ def main():
     )
     parser.add_argument(
         "--out", required=True,
-        help="Output CSV path for predictions.",
+        help="Output path for predictions.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["csv", "parquet"],
+        default="csv",
+        help="Output format: 'csv' or 'parquet' (smaller, needs pyarrow).",
     )
 
     args = parser.parse_args()
@@ -80,12 +105,14 @@ def main():
     if args.mode == "hier":
         print("[INFO] Running hierarchical predictions (normal / dos / other_attack)…")
         df_out = save_predictions_csv(
-            df_feats, args.out, mode="hier", art_dir=args.models
+            df_feats, args.out, mode="hier", art_dir=args.models,
+            fmt=args.format,
         )
     else:
         print("[INFO] Running flat predictions (binary + tri-class)…")
         df_out = save_predictions_csv(
-            df_feats, args.out, mode="flat", art_dir=args.models
+            df_feats, args.out, mode="flat", art_dir=args.models,
+            fmt=args.format,
         )
 
     print(f"[OK] Wrote predictions to: {args.out}")
@@ -19,12 +19,26 @@ from __future__ import annotations
 
 import os
 import json
-from typing import Dict, Any
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from typing import Callable, Dict, Any, Optional
 
 import numpy as np
+import orjson
 import pandas as pd
 import joblib
 
+# pyarrow is optional: its multithreaded C++ CSV writer is much faster than
+# pandas.to_csv, and it enables Parquet output. We fall back to to_csv.
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pa_parquet
+except ImportError:
+    pa = None
+
 # Human-readable labels for the tri-class outputs
 TRI_LABEL_NAMES = {
     0: "normal",        # Benign
@@ -32,6 +46,10 @@ TRI_LABEL_NAMES = {
     2: "other_attack",  # All other attack categories
 }
 
+# Vectorized counterpart of TRI_LABEL_NAMES: fancy-indexing this with the
+# tri-label array replaces a Python-level .map over every row.
+_TRI_LABEL_ARR = np.array([TRI_LABEL_NAMES[i] for i in range(3)], dtype=object)
+
 
   
 # Helper: load feature list
@@ -45,10 +63,187 @@ def get_feature_list(art_dir: str = "models") -> list[str]:
     return feats
 
 
- 
+
+# Optional compiled tree inference (Treelite / ONNX Runtime)
+
+
+def _split_pipeline(pipe):
+    """Split a sklearn pipeline into (preprocessing steps, final forest)."""
+    if hasattr(pipe, "steps") and len(pipe.steps) > 1:
+        return pipe[:-1], pipe.steps[-1][1]
+    return None, pipe
+
+
+def _is_fresh(cache_path: str, src_path: str) -> bool:
+    """
+    True if a cached compiled artifact exists and is at least as new as the
+    source it was built from. Retraining overwrites the joblib pickles, so a
+    cache older than its source must be rebuilt or it would silently serve
+    the old forest.
+    """
+    return (os.path.exists(cache_path)
+            and os.path.getmtime(cache_path) >= os.path.getmtime(src_path))
+
+
+class _TreeliteForest:
+    """
+    predict/predict_proba-compatible wrapper around a Treelite-compiled
+    forest. Runs the pipeline's original preprocessing steps in Python and
+    only swaps the sklearn tree traversal for the compiled shared library.
+    """
+
+    def __init__(self, preprocess, predictor):
+        self._preprocess = preprocess
+        self._predictor = predictor
+
+    def predict_proba(self, X) -> np.ndarray:
+        import treelite_runtime
+
+        if self._preprocess is not None:
+            X = self._preprocess.transform(X)
+        if hasattr(X, "toarray"):  # sparse output from OneHotEncoder
+            X = X.toarray()
+        out = self._predictor.predict(
+            treelite_runtime.DMatrix(np.asarray(X, dtype=np.float32))
+        )
+        if out.ndim == 1:  # binary forests return P(class 1) only
+            out = np.column_stack([1.0 - out, out])
+        return out
+
+    def predict(self, X) -> np.ndarray:
+        # Our forests are trained on integer labels 0..k-1, so argmax
+        # over the probabilities reproduces sklearn's predict.
+        return np.argmax(self.predict_proba(X), axis=1)
+
+
+class _OnnxForest:
+    """
+    predict/predict_proba-compatible wrapper running the forest through an
+    ONNX Runtime session (SIMD-vectorized TreeEnsembleClassifier), with the
+    pipeline's preprocessing steps kept in Python.
+    """
+
+    def __init__(self, preprocess, session):
+        self._preprocess = preprocess
+        self._session = session
+
+    def predict_proba(self, X) -> np.ndarray:
+        if self._preprocess is not None:
+            X = self._preprocess.transform(X)
+        if hasattr(X, "toarray"):  # sparse output from OneHotEncoder
+            X = X.toarray()
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        # Outputs are (label, probabilities); zipmap is disabled at export
+        # so probabilities come back as a dense (N, k) array.
+        return self._session.run(None, {"X": X})[1]
+
+    def predict(self, X) -> np.ndarray:
+        return np.argmax(self.predict_proba(X), axis=1)
+
+
+def _treelite_forest(pipe, lib_path: str, joblib_path: str):
+    """
+    Compile the forest at the end of `pipe` into a Treelite shared library
+    (cached at `lib_path`, recompiled whenever the source pickle at
+    `joblib_path` is newer) and return a predict-compatible wrapper, or
+    None if Treelite is not installed / compilation fails.
+    """
+    try:
+        import treelite
+        import treelite_runtime
+    except ImportError:
+        return None
+
+    try:
+        preprocess, forest = _split_pipeline(pipe)
+        if not _is_fresh(lib_path, joblib_path):
+            model = treelite.sklearn.import_model(forest)
+            model.export_lib(toolchain="gcc", libpath=lib_path,
+                             params={"parallel_comp": 32})
+        return _TreeliteForest(preprocess, treelite_runtime.Predictor(lib_path))
+    except Exception as e:
+        print(f"[WARN] Treelite compilation failed ({e}); trying next backend")
+        return None
+
+
+def _onnx_forest(pipe, onnx_path: str, joblib_path: str):
+    """
+    Export the forest at the end of `pipe` to ONNX (cached at `onnx_path`,
+    re-exported whenever the source pickle at `joblib_path` is newer, and
+    dynamically quantized to int8 when the quantization tooling is present)
+    and return a predict-compatible wrapper running on ONNX Runtime, or
+    None if skl2onnx / onnxruntime are not installed or conversion fails.
+    """
+    try:
+        import onnxruntime as ort
+        from skl2onnx import convert_sklearn
+        from skl2onnx.common.data_types import FloatTensorType
+    except ImportError:
+        return None
+
+    try:
+        preprocess, forest = _split_pipeline(pipe)
+        quant_path = onnx_path + ".int8"
+
+        if not _is_fresh(onnx_path, joblib_path):
+            onx = convert_sklearn(
+                forest,
+                initial_types=[("X", FloatTensorType([None, forest.n_features_in_]))],
+                options={id(forest): {"zipmap": False}},
+            )
+            with open(onnx_path, "wb") as f:
+                f.write(onx.SerializeToString())
+            try:
+                from onnxruntime.quantization import quantize_dynamic
+                quantize_dynamic(onnx_path, quant_path)
+            except Exception:
+                pass  # quantization is best-effort; fp32 model still works
+
+        so = ort.SessionOptions()
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # Only prefer the int8 model when it was built from the current
+        # fp32 export; a leftover from an older export must not win.
+        model_path = quant_path if _is_fresh(quant_path, onnx_path) else onnx_path
+        session = ort.InferenceSession(model_path, so,
+                                       providers=["CPUExecutionProvider"])
+        return _OnnxForest(preprocess, session)
+    except Exception as e:
+        print(f"[WARN] ONNX export failed ({e}); using sklearn predict")
+        return None
+
+
+def _compile_forest(pipe, joblib_path: str):
+    """
+    Return the fastest available predict-compatible wrapper for `pipe`:
+    Treelite if installed, else ONNX Runtime, else the sklearn pipeline
+    itself. Compiled artifacts are cached next to `joblib_path` and rebuilt
+    whenever the pickle (i.e. a retrained model) is newer than the cache.
+    """
+    stem = os.path.splitext(joblib_path)[0]
+    accel = _treelite_forest(pipe, stem + ".so", joblib_path)
+    if accel is not None:
+        return accel
+    accel = _onnx_forest(pipe, stem + ".onnx", joblib_path)
+    if accel is not None:
+        return accel
+    return pipe
+
+
+def _set_forest_n_jobs(pipe, n_jobs: int) -> None:
+    """
+    Set n_jobs on the forest inside `pipe` so predict actually fans out
+    across cores (forests are sometimes pickled with n_jobs=1).
+    """
+    est = pipe.steps[-1][1] if hasattr(pipe, "steps") else pipe
+    if hasattr(est, "n_jobs"):
+        est.n_jobs = n_jobs
+
+
+
 # Load artifacts (same logic as in the notebook)
- 
 
+
+@lru_cache(maxsize=4)
 def load_flat_artifacts(art_dir: str = "models"):
     """
     Load artifacts required for *flat* predictions:
@@ -56,18 +251,30 @@ def load_flat_artifacts(art_dir: str = "models"):
     - Model C (flat tri-class)
     - binary threshold
     - feature list
+
+    Results are cached per `art_dir`, so repeated predict calls pay the
+    joblib deserialization cost only once.
     """
-    pipe_bin = joblib.load(os.path.join(art_dir, "rf_bin.joblib"))
-    pipe_tri = joblib.load(os.path.join(art_dir, "rf_tri.joblib"))
+    bin_path = os.path.join(art_dir, "rf_bin.joblib")
+    tri_path = os.path.join(art_dir, "rf_tri.joblib")
+    pipe_bin = joblib.load(bin_path)
+    pipe_tri = joblib.load(tri_path)
+    _set_forest_n_jobs(pipe_bin, -1)
+    _set_forest_n_jobs(pipe_tri, -1)
+    pipe_bin = _compile_forest(pipe_bin, bin_path)
+    pipe_tri = _compile_forest(pipe_tri, tri_path)
     with open(os.path.join(art_dir, "bin_threshold.json"), "r", encoding="utf-8") as f:
         th = json.load(f)["threshold"]
     feats = get_feature_list(art_dir)
     return pipe_bin, pipe_tri, th, feats
 
 
+@lru_cache(maxsize=4)
 def load_hier_artifacts(art_dir: str = "models") -> Dict[str, Any]:
     """
     Load artifacts required for *hierarchical* predictions (Model A → Model B).
+    Cached per `art_dir` (the pickled forests can be hundreds of MB, so we
+    only want to load them once per process).
     Returns a dict with:
       - pipe_bin: binary pipeline
       - pipe_dos: DoS vs Other pipeline
@@ -75,8 +282,14 @@ def load_hier_artifacts(art_dir: str = "models") -> Dict[str, Any]:
       - t2: DoS threshold
       - feats: feature list
     """
-    pipe_bin = joblib.load(os.path.join(art_dir, "rf_bin.joblib"))
-    pipe_dos = joblib.load(os.path.join(art_dir, "rf_dos_vs_other.joblib"))
+    bin_path = os.path.join(art_dir, "rf_bin.joblib")
+    dos_path = os.path.join(art_dir, "rf_dos_vs_other.joblib")
+    pipe_bin = joblib.load(bin_path)
+    pipe_dos = joblib.load(dos_path)
+    _set_forest_n_jobs(pipe_bin, -1)
+    _set_forest_n_jobs(pipe_dos, -1)
+    pipe_bin = _compile_forest(pipe_bin, bin_path)
+    pipe_dos = _compile_forest(pipe_dos, dos_path)
     with open(os.path.join(art_dir, "bin_threshold.json"), "r", encoding="utf-8") as f:
         t1 = json.load(f)["threshold"]
     with open(os.path.join(art_dir, "dos_threshold.json"), "r", encoding="utf-8") as f:
@@ -108,17 +321,20 @@ def predict_from_df(df_features: pd.DataFrame, mode: str = "both",
       - "both":   both models
     """
     pipe_bin, pipe_tri, th, feats = load_flat_artifacts(art_dir)
-    X = df_features[feats].copy()
+    X = df_features[feats]  # read-only downstream; no need to copy
 
     out: Dict[str, np.ndarray] = {}
 
-    if mode in ("binary", "both"):
-        scores = pipe_bin.predict_proba(X)[:, 1]
-        out["binary_scores"] = scores
-        out["binary_labels"] = (scores >= th).astype(int)
+    # Thread the tree traversal across cores; sklearn forests release the
+    # GIL in C, so the threading backend scales without process overhead.
+    with joblib.parallel_backend("threading", n_jobs=-1):
+        if mode in ("binary", "both"):
+            scores = pipe_bin.predict_proba(X)[:, 1]
+            out["binary_scores"] = scores
+            out["binary_labels"] = (scores >= th).astype(np.int8)
 
-    if mode in ("tri", "both"):
-        out["tri_labels"] = pipe_tri.predict(X)
+        if mode in ("tri", "both"):
+            out["tri_labels"] = pipe_tri.predict(X)
 
     return out
 
@@ -133,21 +349,28 @@ def predict_hier_from_df(df_features: pd.DataFrame,
       - tri_labels:    0=normal, 1=DoS, 2=other_attack
     """
     art = load_hier_artifacts(art_dir)
-    X = df_features[art["feats"]].copy()
-
-    # Stage 1: binary
-    s_bin = art["pipe_bin"].predict_proba(X)[:, 1]
-    is_mal = s_bin >= art["t1"]
-
-    tri = np.zeros(len(X), dtype=int)  # default: 0 (normal)
-    if is_mal.any():
-        s_dos = np.zeros(len(X))
-        s_dos[is_mal] = art["pipe_dos"].predict_proba(X[is_mal])[:, 1]
-        tri[is_mal] = (s_dos[is_mal] >= art["t2"]).astype(int) + 1  # 1=DoS, 2=Other
+    X = df_features[art["feats"]]  # read-only downstream; no need to copy
+
+    # Thread the tree traversal across cores (see predict_from_df).
+    with joblib.parallel_backend("threading", n_jobs=-1):
+        # Stage 1: binary
+        s_bin = art["pipe_bin"].predict_proba(X)[:, 1]
+        is_mal = s_bin >= art["t1"]
+        binary_labels = is_mal.astype(np.int8)
+
+        # Labels fit in int8; the default int64 wastes 8x the bandwidth when
+        # these columns are concatenated and written out by the callers.
+        tri = np.zeros(len(X), dtype=np.int8)  # default: 0 (normal)
+        if is_mal.any():
+            # Score only the malicious subset; no need to scatter through a
+            # full-length scratch array. The pipelines select features by column
+            # name, so the stage-2 input has to stay a DataFrame slice.
+            s_dos = art["pipe_dos"].predict_proba(X.loc[is_mal])[:, 1]
+            tri[is_mal] = (s_dos >= art["t2"]).astype(np.int8) + 1  # 1=DoS, 2=Other
 
     return {
         "binary_scores": s_bin,
-        "binary_labels": (s_bin >= art["t1"]).astype(int),
+        "binary_labels": binary_labels,
         "tri_labels": tri,
     }
 
@@ -155,123 +378,267 @@ def predict_hier_from_df(df_features: pd.DataFrame,
 def save_predictions_csv(df_features: pd.DataFrame,
                          out_csv: str,
                          mode: str = "hier",
-                         art_dir: str = "models") -> pd.DataFrame:
+                         art_dir: str = "models",
+                         chunksize: int = 200_000,
+                         fmt: str = "csv") -> pd.DataFrame:
     """
-    Run predictions on df_features and save results to CSV.
+    Run predictions on df_features and save results to CSV (or Parquet).
 
     mode:
       - "flat": uses predict_from_df(mode="both")
       - "hier": uses predict_hier_from_df
 
+    fmt:
+      - "csv":     pyarrow's multithreaded CSV writer when installed,
+                   otherwise pandas.to_csv
+      - "parquet": zstd-compressed Parquet (requires pyarrow)
+
+    The input is processed in `chunksize`-row batches, appending to the
+    output after each batch, so one huge write (and its peak memory) is
+    avoided for multi-million-row inputs.
+
     Returns the DataFrame that was written.
     """
-    if mode == "flat":
-        out = predict_from_df(df_features, mode="both", art_dir=art_dir)
-    else:
-        out = predict_hier_from_df(df_features, art_dir=art_dir)
+    if fmt == "parquet" and pa is None:
+        raise RuntimeError("Parquet output requires pyarrow to be installed")
+
+    frames = []
+    writer = None
+
+    try:
+        for start in range(0, len(df_features), chunksize):
+            chunk = df_features.iloc[start:start + chunksize]
+
+            if mode == "flat":
+                out = predict_from_df(chunk, mode="both", art_dir=art_dir)
+            else:
+                out = predict_hier_from_df(chunk, art_dir=art_dir)
+
+            df_out = chunk.copy()
+
+            if "binary_scores" in out:
+                df_out["bin_prob_mal"] = out["binary_scores"]
+                df_out["bin_label"] = out["binary_labels"]
+
+            if "tri_labels" in out:
+                df_out["tri_label"] = out["tri_labels"]
+                df_out["final_label"] = _TRI_LABEL_ARR[np.asarray(out["tri_labels"])]
+
+            if pa is not None:
+                table = pa.Table.from_pandas(df_out, preserve_index=False)
+                if writer is None:
+                    if fmt == "parquet":
+                        writer = pa_parquet.ParquetWriter(
+                            out_csv, table.schema, compression="zstd"
+                        )
+                    else:
+                        writer = pa_csv.CSVWriter(out_csv, table.schema)
+                writer.write_table(table)
+            else:
+                df_out.to_csv(out_csv, mode="w" if start == 0 else "a",
+                              header=start == 0, index=False)
+
+            frames.append(df_out)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True)
 
-    df_out = df_features.copy()
 
-    if "binary_scores" in out:
-        df_out["bin_prob_mal"] = out["binary_scores"]
-        df_out["bin_label"] = out["binary_labels"]
+# Parsing helpers for Suricata EVE JSON and Zeek conn.log
 
-    if "tri_labels" in out:
-        df_out["tri_label"] = out["tri_labels"]
-        df_out["final_label"] = df_out["tri_label"].map(TRI_LABEL_NAMES)
+# Base category dictionaries for the two string features. Fixing these keeps
+# the categorical dtype stable across files/chunks; values outside the base
+# lists (rare protocols etc.) extend the categories instead of being lost.
+PROTO_CATS = ["tcp", "udp", "icmp", "unknown"]
+SERVICE_CATS = [
+    "http", "dns", "tls", "ssh", "ftp", "smtp",
+    "dhcp", "smb", "ntp", "failed", "unknown",
+]
 
-    df_out.to_csv(out_csv, index=False)
-    return df_out
 
+def _to_categorical(s: pd.Series, base_cats: list[str]) -> pd.Categorical:
+    """Encode a string column as int8 codes + a small categories array."""
+    s = s.astype(str)
+    extra = sorted(set(s.unique()) - set(base_cats))
+    return pd.Categorical(s, categories=base_cats + extra)
 
-# Parsing helpers for Suricata EVE JSON and Zeek conn.log
 
 def _ensure_types(df: pd.DataFrame, feature_list: list[str]) -> pd.DataFrame:
     """
     Ensure correct dtypes for the 7 features:
 
-      - proto:   string
-      - service: string
+      - proto:   category (see PROTO_CATS)
+      - service: category (see SERVICE_CATS)
       - spkts, dpkts, sbytes, dbytes: int
       - dur:     float
+
+    Categoricals store 1 byte/row of codes instead of an 8-byte object
+    pointer per row, cutting memory and scan cost through preprocessing.
     """
     df = df.copy()
     if "proto" in df.columns:
-        df["proto"] = df["proto"].astype(str)
+        df["proto"] = _to_categorical(df["proto"], PROTO_CATS)
     if "service" in df.columns:
-        df["service"] = df["service"].astype(str)
+        df["service"] = _to_categorical(df["service"], SERVICE_CATS)
     for c in ("spkts", "dpkts", "sbytes", "dbytes"):
         if c in df.columns:
             df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0).astype(int)
     if "dur" in df.columns:
         df["dur"] = pd.to_numeric(df["dur"], errors="coerce").fillna(0.0).astype(float)
 
-    return df[feature_list].copy()
+    # df is already a private copy; selecting columns again must not copy
+    return df[feature_list]
+
+
+# Files below this size are parsed in-process: worker spawn + pickling
+# overhead would outweigh the parallel parse.
+_PARALLEL_MIN_BYTES = 32 * 1024 * 1024
+
+
+def _extract_eve_row(d: dict):
+    """Extract the 7 features from a Suricata EVE record (flow events only)."""
+    if d.get("event_type") != "flow":
+        return None
+    flow = d.get("flow", {})
+    return (
+        d.get("proto", "unknown"),
+        d.get("app_proto", "unknown") or "unknown",
+        flow.get("pkts_toserver", 0),
+        flow.get("pkts_toclient", 0),
+        flow.get("bytes_toserver", 0),
+        flow.get("bytes_toclient", 0),
+        flow.get("duration", 0.0),
+    )
+
+
+def _extract_zeek_row(d: dict):
+    """Extract the 7 features from a Zeek conn.log record."""
+    return (
+        d.get("proto", "unknown"),
+        d.get("service", "unknown") or "unknown",
+        d.get("orig_pkts", 0),
+        d.get("resp_pkts", 0),
+        d.get("orig_bytes", 0),
+        d.get("resp_bytes", 0),
+        d.get("duration", 0.0),
+    )
+
+
+def _parse_jsonl_chunk(path: str, start: int, end: int,
+                       extractor: Callable[[dict], Optional[tuple]]):
+    """
+    Parse the lines of a JSON-lines file whose *start offset* falls inside
+    [start, end), returning one list per feature column.
+
+    Chunk boundaries are arbitrary byte offsets: a worker first realigns to
+    the next line start (unless the previous byte is already a newline), so
+    every line is parsed by exactly one worker.
+
+    The file is memory-mapped: lines come straight out of the page cache as
+    byte slices (no read() syscalls or UTF-8 decode) and feed orjson, which
+    accepts bytes directly.
+    """
+    cols = tuple([] for _ in range(7))
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return cols
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = start
+            if start > 0 and mm[start - 1:start] != b"\n":
+                nl = mm.find(b"\n", start)  # partial line; previous chunk's
+                if nl == -1:
+                    return cols
+                pos = nl + 1
+            mm.seek(pos)
+
+            while mm.tell() < end:
+                line = mm.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    d = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue
+
+                row = extractor(d)
+                if row is None:
+                    continue
+                for col, value in zip(cols, row):
+                    col.append(value)
+
+    return cols
+
+
+def _parse_jsonl_parallel(path: str,
+                          extractor: Callable[[dict], Optional[tuple]],
+                          workers: Optional[int] = None):
+    """
+    Parse a JSON-lines file into per-feature column lists, splitting large
+    files into newline-aligned byte ranges handled by a ProcessPoolExecutor
+    (JSON parsing is CPU-bound, so processes give near-linear speedup).
+    """
+    size = os.path.getsize(path)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or size < _PARALLEL_MIN_BYTES:
+        return _parse_jsonl_chunk(path, 0, size, extractor)
+
+    bounds = [size * i // workers for i in range(workers + 1)]
+    merged = tuple([] for _ in range(7))
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        chunks = ex.map(_parse_jsonl_chunk, repeat(path),
+                        bounds[:-1], bounds[1:], repeat(extractor))
+        for chunk in chunks:
+            for dst, src in zip(merged, chunk):
+                dst.extend(src)
+    return merged
+
+
+def _columns_to_features_df(cols, feats: list[str]) -> pd.DataFrame:
+    protos, services, spkts, dpkts, sbytes, dbytes, durs = cols
+    df = pd.DataFrame({
+        "proto": protos,
+        "service": services,
+        "spkts": spkts,
+        "dpkts": dpkts,
+        "sbytes": sbytes,
+        "dbytes": dbytes,
+        "dur": durs,
+    })
+    return _ensure_types(df, feats)
 
 
 def suricata_eve_to_features_df(eve_json_path: str,
-                                art_dir: str = "models") -> pd.DataFrame:
+                                art_dir: str = "models",
+                                workers: Optional[int] = None) -> pd.DataFrame:
     """
     Parse a Suricata EVE JSON log and return a DataFrame with the 7 features.
 
-    Only `event_type == "flow"` events are used.
+    Only `event_type == "flow"` events are used. Lines are parsed with
+    orjson and accumulated column-wise; large files are split across
+    `workers` processes (default: all cores).
     """
     feats = get_feature_list(art_dir)
-    rows = []
-
-    with open(eve_json_path, "r", encoding="utf-8") as f:
-        for line in f:
-            if not line.strip():
-                continue
-            try:
-                d = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-
-            if d.get("event_type") != "flow":
-                continue
-
-            flow = d.get("flow", {})
-            proto = d.get("proto", "unknown")
-            service = d.get("app_proto", "unknown") or "unknown"
-            spkts = flow.get("pkts_toserver", 0)
-            dpkts = flow.get("pkts_toclient", 0)
-            sbytes = flow.get("bytes_toserver", 0)
-            dbytes = flow.get("bytes_toclient", 0)
-            dur = flow.get("duration", 0.0)
-
-            rows.append([proto, service, spkts, dpkts, sbytes, dbytes, dur])
-
-    df = pd.DataFrame(rows, columns=feats)
-    return _ensure_types(df, feats)
+    cols = _parse_jsonl_parallel(eve_json_path, _extract_eve_row, workers)
+    return _columns_to_features_df(cols, feats)
 
 
 def zeek_conn_to_features_df(conn_log_path: str,
-                             art_dir: str = "models") -> pd.DataFrame:
+                             art_dir: str = "models",
+                             workers: Optional[int] = None) -> pd.DataFrame:
     """
     Parse a Zeek conn.log (JSON per line) and return the features DataFrame.
+    Same chunked/parallel parsing as `suricata_eve_to_features_df`.
     """
     feats = get_feature_list(art_dir)
-    rows = []
-
-    with open(conn_log_path, "r", encoding="utf-8") as f:
-        for line in f:
-            if not line.strip():
-                continue
-            try:
-                d = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-
-            proto = d.get("proto", "unknown")
-            service = d.get("service", "unknown") or "unknown"
-            spkts = d.get("orig_pkts", 0)
-            dpkts = d.get("resp_pkts", 0)
-            sbytes = d.get("orig_bytes", 0)
-            dbytes = d.get("resp_bytes", 0)
-            dur = d.get("duration", 0.0)
-
-            rows.append([proto, service, spkts, dpkts, sbytes, dbytes, dur])
-
-    df = pd.DataFrame(rows, columns=feats)
-    return _ensure_types(df, feats)
+    cols = _parse_jsonl_parallel(conn_log_path, _extract_zeek_row, workers)
+    return _columns_to_features_df(cols, feats)
@@ -6,8 +6,9 @@ Minimal ML REST API for NSA project.
     rf_bin.joblib          -> normal vs attack
     rf_dos_vs_other.joblib -> dos vs other_attack (only if attack)
 
-- Exposes one endpoint:
+- Exposes two prediction endpoints:
     POST /predict_one
+    POST /predict_batch  (a JSON list of up to 10k flows, same schema)
 
   Request JSON:
     {
@@ -28,13 +29,21 @@ Minimal ML REST API for NSA project.
     }
 """
 
+import os
+
+# Single-row predicts contend badly under OpenMP's default thread count;
+# pin it to one thread before anything sklearn-related gets imported.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+
+import asyncio
+import threading
 from pathlib import Path
 from typing import Literal, Optional
 
 import joblib
 import numpy as np
 import pandas as pd
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 
 
@@ -54,6 +63,14 @@ def load_model(filename: str):
 print("[ML-API] Loading models from", MODELS_DIR)
 model_bin = load_model("rf_bin.joblib")
 model_dos = load_model("rf_dos_vs_other.joblib")
+
+# Request batches are tiny (1..BATCH_MAX rows); forest-internal threading
+# only adds contention at that size, so keep the forests single-threaded.
+for _model in (model_bin, model_dos):
+    _est = _model.steps[-1][1] if hasattr(_model, "steps") else _model
+    if hasattr(_est, "n_jobs"):
+        _est.n_jobs = 1
+
 print("[ML-API] Models loaded.")
 
 
@@ -101,34 +118,169 @@ def _is_dos_label(raw) -> bool:
     return s == "dos"
 
 
-def classify_flow(row: dict) -> dict:
+def _flow_key(flow: "FlowInput") -> tuple:
     """
-    Given a dict with the 7 features, run both models and return labels.
+    Canonicalize a FlowInput into a hashable tuple for memoization.
+    `dur` is rounded to 3 decimals so near-identical flows share a cache entry.
     """
-    df = pd.DataFrame([row])
-
-    # 1) binary model: normal vs attack
-    bin_raw = model_bin.predict(df)[0]
-    is_attack = _is_attack_label(bin_raw)
-    bin_label = "attack" if is_attack else "normal"
-
-    dos_vs_other_label: Optional[str] = None
-    final_label: str
+    return (
+        flow.proto,
+        flow.service,
+        flow.spkts,
+        flow.dpkts,
+        flow.sbytes,
+        flow.dbytes,
+        round(flow.dur, 3),
+    )
+
+
+# Memoized predictions: repeated flow tuples (very common in Suricata
+# traffic) skip both sklearn predicts entirely. Explicit dict (instead of
+# functools.lru_cache) so the batch worker below can check and fill it.
+_CACHE_MAX = 100_000
+_pred_cache: dict = {}
+# predict_batch fills the cache from FastAPI's threadpool while the batch
+# worker fills it from the event-loop thread; serialize writers so two
+# concurrent evictions can't race on the same key.
+_cache_lock = threading.Lock()
+
+
+def _cache_put(key: tuple, result: "FlowOutput") -> None:
+    with _cache_lock:
+        if len(_pred_cache) >= _CACHE_MAX:
+            _pred_cache.pop(next(iter(_pred_cache)), None)  # evict oldest
+        _pred_cache[key] = result
+
+
+def _keys_to_df(keys: list) -> pd.DataFrame:
+    """
+    Build the model input frame column-by-column with explicit dtypes.
+    Row-wise `pd.DataFrame([row])` costs hundreds of microseconds in block
+    manager / dtype inference — often more than the predict itself. The
+    pipelines select features by column name, so we keep a DataFrame but
+    construct it columnar.
+    """
+    protos, services, spkts, dpkts, sbytes, dbytes, durs = zip(*keys)
+    return pd.DataFrame(
+        {
+            "proto": protos,
+            "service": services,
+            "spkts": np.asarray(spkts, dtype=np.int64),
+            "dpkts": np.asarray(dpkts, dtype=np.int64),
+            "sbytes": np.asarray(sbytes, dtype=np.int64),
+            "dbytes": np.asarray(dbytes, dtype=np.int64),
+            "dur": np.asarray(durs, dtype=np.float64),
+        }
+    )
+
+
+def _classify_batch(keys: list) -> list:
+    """
+    Run both models once on a whole batch of flow tuples and return one
+    FlowOutput per input key, in order. This is the only place the sklearn
+    models are actually called: single-flow and batched paths both route
+    through here so per-call overhead is amortized over the batch.
+    """
+    df = _keys_to_df(keys)
+
+    # 1) binary model: normal vs attack (vectorized over the batch)
+    bin_raw = model_bin.predict(df)
+    is_attack = [_is_attack_label(r) for r in bin_raw]
+
+    # model_construct skips Pydantic field validation: the labels come from
+    # our own fixed vocabulary, and building the response model once per
+    # unique flow (results are cached) beats re-validating a dict per request.
+    results = [
+        FlowOutput.model_construct(
+            bin_label="attack" if a else "normal",
+            dos_vs_other_label=None,
+            final_label="normal",
+        )
+        for a in is_attack
+    ]
+
+    # 2) second model: dos vs other_attack, only for the attack subset
+    attack_idx = [i for i, a in enumerate(is_attack) if a]
+    if attack_idx:
+        dos_raw = model_dos.predict(df.iloc[attack_idx])
+        for i, raw in zip(attack_idx, dos_raw):
+            label = "dos" if _is_dos_label(raw) else "other_attack"
+            results[i] = FlowOutput.model_construct(
+                bin_label="attack",
+                dos_vs_other_label=label,
+                final_label=label,
+            )
+
+    return results
+
+
+def classify_flow(key: tuple) -> "FlowOutput":
+    """
+    Synchronous single-flow entry point (see `_flow_key` for the key layout).
+    Checks the memo cache first and falls back to a batch of one.
+    """
+    cached = _pred_cache.get(key)
+    if cached is not None:
+        return cached
+    result = _classify_batch([key])[0]
+    _cache_put(key, result)
+    return result
 
-    if not is_attack:
-        final_label = "normal"
-    else:
-        # 2) second model: dos vs other_attack
-        dos_raw = model_dos.predict(df)[0]
-        is_dos = _is_dos_label(dos_raw)
-        dos_vs_other_label = "dos" if is_dos else "other_attack"
-        final_label = dos_vs_other_label
 
-    return {
-        "bin_label": bin_label,
-        "dos_vs_other_label": dos_vs_other_label,
-        "final_label": final_label,
-    }
+# ---------- Micro-batching ----------------------------------------------------
+#
+# Per-request sklearn overhead (input validation, DataFrame -> ndarray
+# conversion, predict dispatch) dwarfs the actual tree traversal for a single
+# row. Concurrent requests are therefore queued for up to BATCH_WINDOW_S and
+# classified with one vectorized predict over the stacked batch.
+
+BATCH_WINDOW_S = 0.005
+BATCH_MAX = 256
+
+_batch_queue: "asyncio.Queue[tuple[tuple, asyncio.Future]]" = None  # type: ignore[assignment]
+_batch_worker_task: Optional["asyncio.Task"] = None
+
+
+async def _batch_worker() -> None:
+    while True:
+        pending = [await _batch_queue.get()]
+        while len(pending) < BATCH_MAX:
+            try:
+                pending.append(
+                    await asyncio.wait_for(_batch_queue.get(), timeout=BATCH_WINDOW_S)
+                )
+            except asyncio.TimeoutError:
+                break
+
+        keys = [key for key, _ in pending]
+        try:
+            results = await asyncio.to_thread(_classify_batch, keys)
+            for (key, fut), result in zip(pending, results):
+                _cache_put(key, result)
+                if not fut.done():
+                    fut.set_result(result)
+        except Exception as exc:  # pragma: no cover - model failure
+            # Fail every waiter in this batch rather than letting the
+            # exception escape and kill the worker (which would leave all
+            # future cache misses awaiting futures that never resolve).
+            for _, fut in pending:
+                if not fut.done():
+                    fut.set_exception(exc)
+
+
+def _spawn_batch_worker() -> None:
+    # Keep a module-level reference so the task isn't garbage-collected,
+    # and restart it if it ever dies with an unexpected exception.
+    global _batch_worker_task
+    _batch_worker_task = asyncio.create_task(_batch_worker())
+    _batch_worker_task.add_done_callback(_on_batch_worker_done)
+
+
+def _on_batch_worker_done(task: "asyncio.Task") -> None:
+    if task.cancelled():  # normal shutdown
+        return
+    print(f"[ML-API] Batch worker exited unexpectedly ({task.exception()!r}); restarting.")
+    _spawn_batch_worker()
 
 
 # ---------- FastAPI app ------------------------------------------------------
@@ -140,15 +292,71 @@ app = FastAPI(
 )
 
 
+_WARMUP_FLOW = ("tcp", "http", 1, 1, 1, 1, 0.1)
+
+
+@app.on_event("startup")
+async def _start_batch_worker():
+    global _batch_queue
+    _batch_queue = asyncio.Queue()
+    _spawn_batch_worker()
+
+    # Warm the models up so the first real request doesn't pay the
+    # page-fault/allocator costs of the first predict. Goes through
+    # _classify_batch directly so the memo cache can't short-circuit it.
+    for _ in range(50):
+        _classify_batch([_WARMUP_FLOW])
+    print("[ML-API] Warmup predictions done.")
+
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
 
 @app.post("/predict_one", response_model=FlowOutput)
-def predict_one(flow: FlowInput):
+async def predict_one(flow: FlowInput):
     """
     Classify a single flow into: normal / dos / other_attack.
+
+    Cache hits return immediately; misses are queued so that concurrent
+    requests share one vectorized predict (see `_batch_worker`).
     """
-    result = classify_flow(flow.dict())
-    return result
+    key = _flow_key(flow)
+    cached = _pred_cache.get(key)
+    if cached is not None:
+        return cached
+
+    fut = asyncio.get_running_loop().create_future()
+    await _batch_queue.put((key, fut))
+    return await fut
+
+
+MAX_BATCH_FLOWS = 10_000  # bound per-request latency and memory
+
+
+@app.post("/predict_batch", response_model=list[FlowOutput])
+def predict_batch(flows: list[FlowInput]):
+    """
+    Classify a list of flows in one call, amortizing HTTP, validation and
+    model dispatch over the whole batch. Results come back in input order.
+    """
+    if len(flows) > MAX_BATCH_FLOWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(flows)} flows (max {MAX_BATCH_FLOWS})",
+        )
+    if not flows:
+        return []
+
+    keys = [_flow_key(flow) for flow in flows]
+    results = [_pred_cache.get(key) for key in keys]
+
+    miss = [i for i, r in enumerate(results) if r is None]
+    if miss:
+        computed = _classify_batch([keys[i] for i in miss])
+        for i, result in zip(miss, computed):
+            _cache_put(keys[i], result)
+            results[i] = result
+
+    return results